@@ -68,7 +68,8 @@ class Config:
                 "max_data_points": {"type": "integer", "min": 100, "max": 100000, "default": 1000},
                 "default_chart_type": {"type": "string", "enum": ["line", "bar", "gauge"], "default": "line"},
                 "auto_scale": {"type": "boolean", "default": True},
-                "default_color": {"type": "string", "default": "#0000FF"}
+                "default_color": {"type": "string", "default": "#0000FF"},
+                "use_opengl": {"type": "boolean", "default": False}  # GPU line charts, needs PyOpenGL
             },
             "scripting": {
                 "script_directory": {"type": "string", "default": str(self.config_dir / "scripts")},
@@ -77,7 +78,8 @@ class Config:
                 "allowed_modules": {"type": "array", "items": {"type": "string"},
                                    "default": ["time", "math", "random", "datetime", "json", "re"]},
                 "max_execution_time": {"type": "integer", "min": 1, "max": 300, "default": 60},  # seconds
-                "max_memory_usage": {"type": "integer", "min": 1048576, "max": 1073741824, "default": 104857600}  # 100 MB
+                "max_memory_usage": {"type": "integer", "min": 1048576, "max": 1073741824, "default": 104857600},  # 100 MB
+                "max_worker_runs": {"type": "integer", "min": 1, "max": 1000, "default": 50}  # runs before the script worker is restarted
             }
         }
         
@@ -875,6 +875,9 @@ class MainWindow(QMainWindow):
             # Disconnect all devices
             self.app.serial_manager.close_all_connections()
             
+            # Stop the script worker process
+            self.script_editor.shutdown()
+            
             # Shutdown the application
             self.app.shutdown()
             
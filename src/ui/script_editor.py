@@ -18,6 +18,12 @@ import threading
 import queue
 import io
 import contextlib
+import codecs
+import functools
+import shutil
+import subprocess
+import tempfile
+import uuid
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
@@ -28,7 +34,7 @@ from PyQt6.QtWidgets import (
     QHeaderView, QListWidget, QListWidgetItem, QScrollArea,
     QTreeWidget, QTreeWidgetItem, QPlainTextEdit, QStatusBar
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QProcess
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QProcess, QSocketNotifier
 from PyQt6.QtGui import (
     QAction, QIcon, QColor, QPen, QBrush, QPainter, QPainterPath,
     QTextCursor, QSyntaxHighlighter, QTextCharFormat, QFont,
@@ -37,9 +43,26 @@ from PyQt6.QtGui import (
 
 logger = logging.getLogger(__name__)
 
+# psutil is optional, without it the worker's own memory limit is the only one
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Script type by file extension, anything else is a simple script
+_SCRIPT_EXT_MAP = {".py": "python"}
+
+# Valid script names, checked by the new/rename dialogs
+_NAME_RE = re.compile(r'\A[A-Za-z0-9_-]+\Z')
+
 class ScriptEditor(QWidget):
     """Widget for creating and editing automation scripts"""
     
+    # Signals
+    output_ready = pyqtSignal(str)  # batch of script output
+    run_finished = pyqtSignal()  # a script run is over
+    worker_exited = pyqtSignal(object)  # subprocess.Popen of the exited worker
+    
     def __init__(self, app):
         """Initialize the script editor"""
         super().__init__()
@@ -49,17 +72,35 @@ class ScriptEditor(QWidget):
         # Script storage
         self.scripts = {}  # name -> {content, type, last_modified}
         self.current_script = None
+        self.saved_hashes = {}  # name -> content hash of the file on disk
+        self.script_items = {}  # name -> QTreeWidgetItem in the script list
+        self.script_categories = {}  # type label -> category QTreeWidgetItem
         
         # Script execution
         self.script_running = False
         self.script_output = ""
-        self.script_process = None
+        self.script_process = None  # Persistent worker running Python scripts
+        self.script_process_runs = 0
+        self.script_process_config = None
+        self.script_process_reusable = False  # Cleared when a run fails, the worker may be exiting
+        self.script_temp_dir = None
+        self.python_run_active = False
+        self.script_done_marker = None  # Line the worker prints after each run
         self.script_timeout_timer = None
         self.resource_monitor_timer = None
         
         # Initialize UI components
         self._init_ui()
         
+        # Script output can come from other threads, so it is always
+        # queued to the UI thread
+        self.output_ready.connect(self._write_output, Qt.ConnectionType.QueuedConnection)
+        
+        # Runs end on worker and reader threads too, the timers and actions
+        # are only touched from the UI thread
+        self.run_finished.connect(self._script_finished, Qt.ConnectionType.QueuedConnection)
+        self.worker_exited.connect(self._script_process_exited, Qt.ConnectionType.QueuedConnection)
+        
         # Load scripts
         self._load_scripts()
     
@@ -212,6 +253,7 @@ class ScriptEditor(QWidget):
                         "type": "simple",
                         "last_modified": script_file.stat().st_mtime
                     }
+                    self.saved_hashes[name] = self._script_hash(self.scripts[name])
                 except Exception as e:
                     logger.error(f"Error loading simple script {script_file}: {e}")
             
@@ -228,6 +270,7 @@ class ScriptEditor(QWidget):
                         "type": "python",
                         "last_modified": script_file.stat().st_mtime
                     }
+                    self.saved_hashes[name] = self._script_hash(self.scripts[name])
                 except Exception as e:
                     logger.error(f"Error loading Python script {script_file}: {e}")
             
@@ -240,30 +283,56 @@ class ScriptEditor(QWidget):
             QMessageBox.critical(self, "Error", f"Error loading scripts: {e}")
     
     def _update_script_list(self):
-        """Update the script list"""
+        """Update the script list, only touching scripts that changed"""
         try:
-            # Clear the list
-            self.script_list.clear()
+            # Create the category items the first time
+            if not self.script_categories:
+                self.script_list.clear()
+                self.script_items = {}
+                
+                simple_category = QTreeWidgetItem(self.script_list, ["Simple Automation"])
+                python_category = QTreeWidgetItem(self.script_list, ["Python Scripts"])
+                
+                # Expand the categories
+                simple_category.setExpanded(True)
+                python_category.setExpanded(True)
+                
+                self.script_categories = {"Simple": simple_category, "Python": python_category}
             
-            # Create category items
-            simple_category = QTreeWidgetItem(self.script_list, ["Simple Automation"])
-            python_category = QTreeWidgetItem(self.script_list, ["Python Scripts"])
+            # Suppress repaints and selection signals while the tree changes
+            self.script_list.setUpdatesEnabled(False)
+            self.script_list.blockSignals(True)
             
-            # Add scripts to the appropriate category
-            for name, script in self.scripts.items():
-                if script["type"] == "simple":
-                    item = QTreeWidgetItem(simple_category, [name, "Simple"])
-                    item.setData(0, Qt.ItemDataRole.UserRole, name)
-                else:
-                    item = QTreeWidgetItem(python_category, [name, "Python"])
+            try:
+                # Remove scripts that were deleted, renamed or changed type
+                for name, item in list(self.script_items.items()):
+                    script = self.scripts.get(name)
+                    
+                    if script is None or item.text(1) != self._script_type_label(script):
+                        item.parent().removeChild(item)
+                        del self.script_items[name]
+                
+                # Add scripts that are not in the list yet
+                for name, script in self.scripts.items():
+                    if name in self.script_items:
+                        continue
+                    
+                    type_label = self._script_type_label(script)
+                    item = QTreeWidgetItem(self.script_categories[type_label], [name, type_label])
                     item.setData(0, Qt.ItemDataRole.UserRole, name)
-            
-            # Expand the categories
-            simple_category.setExpanded(True)
-            python_category.setExpanded(True)
+                    
+                    self.script_items[name] = item
+            finally:
+                self.script_list.blockSignals(False)
+                self.script_list.setUpdatesEnabled(True)
         except Exception as e:
             logger.error(f"Error updating script list: {e}")
     
+    @staticmethod
+    def _script_type_label(script):
+        """Get the label shown in the script list for the type of a script"""
+        return "Simple" if script["type"] == "simple" else "Python"
+    
     def _script_selected(self):
         """Handle script selection"""
         try:
@@ -409,6 +478,7 @@ if __name__ == "__main__":
                 # Remove from the scripts dictionary
                 if name in self.scripts:
                     del self.scripts[name]
+                self.saved_hashes.pop(name, None)
                 
                 # Clear the editor if this was the current script
                 if self.current_script == name:
@@ -443,21 +513,39 @@ if __name__ == "__main__":
         if not self.current_script:
             return
         
+        self._update_current_script()
+        
+        # Save to file, but only if it changed since it was last written
+        if self.saved_hashes.get(self.current_script) != self._script_hash(self.scripts[self.current_script]):
+            self._save_script_to_file(self.current_script)
+    
+    def _update_current_script(self):
+        """Update the scripts dictionary from the editor without saving to file"""
+        if not self.current_script:
+            return
+        
         # Get the script content
         content = self.editor.toPlainText()
         
         # Get the script type
         script_type = self.script_type_combo.currentData()
         
+        # Nothing to do if the script is unchanged
+        script = self.scripts.get(self.current_script)
+        if script and script["content"] == content and script["type"] == script_type:
+            return
+        
         # Update the script
         self.scripts[self.current_script] = {
             "content": content,
             "type": script_type,
             "last_modified": time.time()
         }
-        
-        # Save to file
-        self._save_script_to_file(self.current_script)
+    
+    @staticmethod
+    def _script_hash(script):
+        """Get a hash identifying the content and type of a script"""
+        return hash((script["type"], script["content"]))
     
     def _save_script_to_file(self, name):
         """Save a script to a file"""
@@ -479,6 +567,7 @@ if __name__ == "__main__":
             
             # Update the last modified time
             script["last_modified"] = file_path.stat().st_mtime
+            self.saved_hashes[name] = self._script_hash(script)
         except Exception as e:
             logger.error(f"Error saving script to file: {e}")
             raise
@@ -514,8 +603,9 @@ if __name__ == "__main__":
                 QMessageBox.warning(self, "Run Script", "No script selected.")
                 return
             
-            # Save the script first
-            self._save_current_script()
+            # Pick up the editor content; the script is passed to the
+            # process directly, so there is no need to save it to file first
+            self._update_current_script()
             
             # Get the script
             script = self.scripts[self.current_script]
@@ -544,7 +634,9 @@ if __name__ == "__main__":
             if script["type"] == "simple":
                 threading.Thread(target=self._run_simple_script, daemon=True).start()
             else:
-                threading.Thread(target=self._run_python_script, daemon=True).start()
+                # The script runs in its own process, its output is watched
+                # from the event loop
+                self._run_python_script()
                 
             # Start monitoring resource usage
             self.resource_monitor_timer = QTimer(self)
@@ -565,7 +657,8 @@ if __name__ == "__main__":
     
     def _monitor_script_resources(self):
         """Monitor script resource usage"""
-        if not self.script_running or not hasattr(self, 'script_process') or not self.script_process:
+        # Only a Python run uses the worker, it is idle during simple scripts
+        if psutil is None or not self.python_run_active or not self.script_process:
             return
         
         try:
@@ -644,96 +737,270 @@ if __name__ == "__main__":
             self._append_output(f"\nError: {e}")
         finally:
             # Update UI
-            self._script_finished()
+            self.run_finished.emit()
     
     def _run_python_script(self):
-        """Run a Python script in a separate process with safety measures"""
+        """Run a Python script in the script worker process"""
         try:
             script = self.scripts[self.current_script]
             
             self._append_output("Starting Python script in isolated environment...\n")
             
-            # Create a temporary directory for script execution
-            temp_dir = tempfile.mkdtemp(prefix="script_")
-            
-            # Create a unique ID for this script execution
-            execution_id = str(uuid.uuid4())
+            # Get the worker process, starting a new one if needed
+            worker = self._get_script_worker()
             
-            # Create the script file
-            script_path = os.path.join(temp_dir, f"{self.current_script}.py")
-            
-            # Create a wrapper script that provides a restricted API
-            wrapper_script = self._create_script_wrapper(script["content"], execution_id)
-            wrapper_path = os.path.join(temp_dir, f"wrapper_{execution_id}.py")
+            # Send the script to the worker as a "<length> <name>" header
+            # line followed by the source
+            source = script["content"].encode("utf-8")
+            self.python_run_active = True
+            worker.stdin.write(f"{len(source)} {self.current_script}\n".encode("utf-8") + source)
+            worker.stdin.flush()
+                
+        except Exception as e:
+            logger.error(f"Error running Python script: {e}")
+            self._append_output(f"\nError: {e}")
+            self._append_output(f"\nTraceback:\n{traceback.format_exc()}")
+            self.python_run_active = False
+            self._script_finished()
+    
+    def _get_script_worker(self):
+        """Get the script worker process, starting a new one if needed"""
+        worker_config = self._get_script_worker_config()
+        max_runs = self.app.config.get("scripting", "max_worker_runs", 50)
+        
+        # Reuse the running worker unless it is due to be recycled
+        if (self.script_process and self.script_process.poll() is None
+                and self.script_process_reusable
+                and self.script_process_runs < max_runs
+                and self.script_process_config == worker_config):
+            self.script_process_runs += 1
+            return self.script_process
+        
+        self._stop_script_worker()
+        
+        # Create a temporary directory for script execution
+        temp_dir = tempfile.mkdtemp(prefix="script_")
+        self.script_temp_dir = temp_dir
+        
+        # Create a unique ID for this worker
+        execution_id = str(uuid.uuid4())
+        
+        # The end of a run is reported with a marker line only this worker knows
+        self.script_done_marker = f"[DONE {execution_id}]"
+        
+        # Create a wrapper script that provides a restricted API
+        wrapper_script = self._create_script_wrapper(self.script_done_marker)
+        wrapper_path = os.path.join(temp_dir, f"wrapper_{execution_id}.py")
+        
+        # Write the wrapper to disk, scripts are sent over stdin
+        with open(wrapper_path, 'w') as f:
+            f.write(wrapper_script)
+        
+        # Get Python path from config or use system Python
+        python_path = worker_config[0]
+        
+        # Start the process
+        self._append_output(f"Starting script worker with Python: {python_path}\n")
+        
+        # Create environment with restricted modules
+        env = os.environ.copy()
+        env["PYTHONPATH"] = temp_dir
+        
+        # Start the process (output is read as raw bytes and decoded
+        # by _feed_process_output)
+        self.script_process = subprocess.Popen(
+            [python_path, wrapper_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=temp_dir
+        )
+        self.script_process_runs = 1
+        self.script_process_config = worker_config
+        self.script_process_reusable = True
+        
+        # Start reading output
+        self._start_output_readers()
+        
+        return self.script_process
+    
+    def _get_script_worker_config(self):
+        """Get the configuration values the script worker is started with"""
+        python_path = self.app.config.get("scripting", "python_path", "")
+        if not python_path:
+            python_path = sys.executable
+        
+        return (
+            python_path,
+            tuple(self.app.config.get("scripting", "allowed_modules",
+                                      ["time", "math", "random", "datetime", "json", "re"])),
+            self.app.config.get("scripting", "max_execution_time", 60),
+            self.app.config.get("scripting", "max_memory_usage", 104857600)
+        )
+    
+    def _stop_script_worker(self):
+        """Shut down the idle script worker process"""
+        process = self.script_process
+        self.script_process = None
+        
+        self._stop_output_readers()
+        
+        if process and process.poll() is None:
+            try:
+                # The worker exits when its input is closed
+                process.stdin.close()
+            except OSError as e:
+                logger.warning(f"Error shutting down script worker: {e}")
+        
+        self._cleanup_script_temp_dir()
+    
+    def shutdown(self):
+        """Stop the script worker and remove its directory before the application exits"""
+        try:
+            process = self.script_process
             
-            # Write the scripts to disk
-            with open(script_path, 'w') as f:
-                f.write(script["content"])
+            if process and process.poll() is None:
+                if self.python_run_active:
+                    process.kill()
+                else:
+                    # An idle worker exits when its input is closed
+                    process.stdin.close()
                 
-            with open(wrapper_path, 'w') as f:
-                f.write(wrapper_script)
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
             
-            # Get Python path from config or use system Python
-            python_path = self.app.config.get("scripting", "python_path", "")
-            if not python_path:
-                python_path = sys.executable
+            self.python_run_active = False
+            self._stop_script_worker()
+        except Exception as e:
+            logger.error(f"Error shutting down script worker: {e}")
+    
+    def _start_output_readers(self):
+        """Start reading stdout and stderr of the script process"""
+        process = self.script_process
+        
+        # Per-stream incremental decoders and unterminated line remainders
+        self._output_decoders = {
+            False: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            True: codecs.getincrementaldecoder("utf-8")(errors="replace")
+        }
+        self._output_partial = {False: "", True: ""}
+        
+        if os.name == "posix":
+            # Watch the pipes from the Qt event loop, no reader threads needed
+            self._output_notifiers = {}
+            
+            for pipe, is_error in ((process.stdout, False), (process.stderr, True)):
+                fd = pipe.fileno()
+                os.set_blocking(fd, False)
                 
-            # Create a pipe for communication
-            self.script_output_queue = multiprocessing.Queue()
-            
-            # Start the process
-            self._append_output(f"Executing script with Python: {python_path}\n")
-            
-            # Create environment with restricted modules
-            env = os.environ.copy()
-            allowed_modules = self.app.config.get("scripting", "allowed_modules",
-                                                ["time", "math", "random", "datetime", "json", "re"])
-            env["PYTHONPATH"] = temp_dir
-            
-            # Start the process
-            self.script_process = subprocess.Popen(
-                [python_path, wrapper_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-                cwd=temp_dir
-            )
+                notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+                notifier.activated.connect(functools.partial(self._drain_process_pipe, fd, is_error))
+                self._output_notifiers[is_error] = notifier
+        else:
+            # select() does not work on Windows pipes, fall back to threads
+            readers = [
+                threading.Thread(target=self._read_process_output,
+                                 args=(process.stdout, False), daemon=True),
+                threading.Thread(target=self._read_process_output,
+                                 args=(process.stderr, True), daemon=True)
+            ]
+            
+            for reader in readers:
+                reader.start()
+            
+            threading.Thread(target=self._wait_for_script_process,
+                             args=(process, readers), daemon=True).start()
+    
+    def _stop_output_readers(self):
+        """Stop watching the pipes of the script process"""
+        for notifier in getattr(self, '_output_notifiers', {}).values():
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+        
+        self._output_notifiers = {}
+    
+    def _drain_process_pipe(self, fd, is_error, *args):
+        """Read the data available on a script output pipe"""
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.warning(f"Error reading script output: {e}")
+            chunk = b""
+        
+        if chunk:
+            self._feed_process_output(chunk, is_error)
+            return
+        
+        # End of file, the process closed this pipe
+        self._feed_process_output(b"", is_error, final=True)
+        self._output_notifiers[is_error].setEnabled(False)
+        
+        if not any(notifier.isEnabled() for notifier in self._output_notifiers.values()):
+            self._script_process_exited(self.script_process)
+    
+    def _wait_for_script_process(self, process, readers):
+        """Wait for the script process and its output readers to finish"""
+        process.wait()
+        
+        for reader in readers:
+            reader.join()
+        
+        self.worker_exited.emit(process)
+    
+    def _script_process_exited(self, process):
+        """Handle the script worker process exiting"""
+        if process is None or process is not self.script_process:
+            # A recycled worker shutting down
+            return
+        
+        try:
+            self._stop_output_readers()
             
-            # Start threads to read output
-            threading.Thread(target=self._read_process_output,
-                            args=(self.script_process.stdout, False),
-                            daemon=True).start()
-            threading.Thread(target=self._read_process_output,
-                            args=(self.script_process.stderr, True),
-                            daemon=True).start()
+            # Both pipes are closed, so the process is exiting
+            returncode = process.wait()
             
-            # Wait for the process to complete
-            self.script_process.wait()
+            self.script_process = None
+            self._cleanup_script_temp_dir()
             
-            # Check return code
-            if self.script_process.returncode != 0:
-                self._append_output(f"\nScript exited with error code: {self.script_process.returncode}")
-            else:
-                self._append_output("\nScript execution completed successfully.")
-                
-            # Clean up
-            try:
-                import shutil
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                logger.warning(f"Error cleaning up temporary directory: {e}")
-                
+            # The worker died in the middle of a run
+            if self.python_run_active:
+                self._finish_python_script(returncode)
         except Exception as e:
-            logger.error(f"Error running Python script: {e}")
-            self._append_output(f"\nError: {e}")
-            self._append_output(f"\nTraceback:\n{traceback.format_exc()}")
-        finally:
-            # Update UI
-            self._script_finished()
+            logger.error(f"Error handling script process exit: {e}")
+    
+    def _finish_python_script(self, returncode):
+        """Report the exit status of a Python script run"""
+        self.python_run_active = False
+        
+        # Check return code
+        if returncode != 0:
+            self._append_output(f"\nScript exited with error code: {returncode}")
+        else:
+            self._append_output("\nScript execution completed successfully.")
+        
+        # Can be reached from the output reader threads
+        self.run_finished.emit()
     
-    def _create_script_wrapper(self, script_content, execution_id):
-        """Create a wrapper script that provides a restricted API"""
+    def _cleanup_script_temp_dir(self):
+        """Remove the temporary directory of the last script run"""
+        if not getattr(self, 'script_temp_dir', None):
+            return
+        
+        try:
+            shutil.rmtree(self.script_temp_dir)
+        except Exception as e:
+            logger.warning(f"Error cleaning up temporary directory: {e}")
+        
+        self.script_temp_dir = None
+    
+    def _create_script_wrapper(self, done_marker):
+        """Create the worker script that runs user scripts with a restricted API"""
         # Get allowed modules from config
         allowed_modules = self.app.config.get("scripting", "allowed_modules",
                                              ["time", "math", "random", "datetime", "json", "re"])
@@ -742,7 +1009,7 @@ if __name__ == "__main__":
         wrapper = f"""#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 \"\"\"
-Secure wrapper for user script execution
+Secure wrapper for user script execution, runs every script it is sent
 \"\"\"
 
 import sys
@@ -751,17 +1018,70 @@ import importlib
 import time
 import json
 import traceback
+import io
+import atexit
+import threading
+import signal
+
+# Buffer output in 64 KiB blocks instead of one write per line; the parent
+# still receives whole lines, just in larger batches
+sys.stdout = io.TextIOWrapper(io.BufferedWriter(io.FileIO(sys.stdout.fileno(), "w", closefd=False), 65536), encoding="utf-8", line_buffering=False)
+sys.stderr = io.TextIOWrapper(io.BufferedWriter(io.FileIO(sys.stderr.fileno(), "w", closefd=False), 65536), encoding="utf-8", line_buffering=False)
+atexit.register(sys.stdout.flush)
+atexit.register(sys.stderr.flush)
+
+# One thread, started before the memory limit is set, flushes the output
+# every 50 ms while a script runs and enforces the run's time limit
+run_active = threading.Event()
+run_deadline = None
+
+def _run_watchdog():
+    while True:
+        run_active.wait()
+        time.sleep(0.05)
+        
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except ValueError:
+            # Streams already closed during interpreter shutdown
+            return
+        
+        deadline = run_deadline
+        if deadline is not None and time.monotonic() > deadline:
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+
+threading.Thread(target=_run_watchdog, daemon=True).start()
+
+# Scripts are read from a private copy of stdin, user scripts get an empty one
+script_input = os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+null_fd = os.open(os.devnull, os.O_RDONLY)
+os.dup2(null_fd, sys.stdin.fileno())
+os.close(null_fd)
+sys.stdin = open(os.devnull, "r")
 
 # Set resource limits
 try:
     import resource
-    # Set CPU time limit (seconds)
-    resource.setrlimit(resource.RLIMIT_CPU, ({self.app.config.get("scripting", "max_execution_time", 60)}, {self.app.config.get("scripting", "max_execution_time", 60)}))
     # Set memory limit (bytes)
     resource.setrlimit(resource.RLIMIT_AS, ({self.app.config.get("scripting", "max_memory_usage", 104857600)}, {self.app.config.get("scripting", "max_memory_usage", 104857600)}))
 except ImportError:
+    resource = None
     print("Warning: resource module not available, cannot set resource limits")
 
+def limit_cpu_time(seconds):
+    # The CPU time limit covers the whole process, so it is moved forward
+    # for every script run by this worker
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
 # Set up restricted imports
 allowed_modules = {allowed_modules}
 original_import = __builtins__.__import__
@@ -802,19 +1122,50 @@ class RestrictedAPI:
 # Create the API
 api = RestrictedAPI()
 
-# Run the user script with periodic timeout checks
-try:
-    # Import the user script
-    from {self.current_script} import *
+# Run the user scripts sent by the editor, each one is a "<length> <name>"
+# header line followed by <length> bytes of source
+while True:
+    header = script_input.readline()
+    if not header:
+        break
+    
+    length, _, name = header.decode("utf-8").strip().partition(" ")
+    source = script_input.read(int(length)).decode("utf-8")
+    
+    # Enforce the time limits for this run
+    api.start_time = time.time()
+    limit_cpu_time(api.max_execution_time)
+    run_deadline = time.monotonic() + api.max_execution_time
+    run_active.set()
+    
+    status = 0
+    failed = False
+    try:
+        script_globals = {{"__name__": name, "__builtins__": __builtins__, "api": api}}
+        exec(compile(source, name + ".py", "exec"), script_globals)
+        
+        # Check if there's a main function and call it
+        if 'main' in script_globals and callable(script_globals['main']):
+            script_globals['main']()
+    
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception as e:
+        print(f"Error: {{type(e).__name__}}: {{str(e)}}")
+        print(traceback.format_exc())
+        status = 1
+        failed = True
+    finally:
+        run_active.clear()
+        run_deadline = None
     
-    # Check if there's a main function and call it
-    if 'main' in globals() and callable(globals()['main']):
-        main()
+    # Tell the editor the run is over
+    sys.stderr.flush()
+    print(f"{done_marker} {{status}}", flush=True)
     
-except Exception as e:
-    print(f"Error: {{type(e).__name__}}: {{str(e)}}")
-    print(traceback.format_exc())
-    sys.exit(1)
+    # Don't reuse a worker after an uncaught exception
+    if failed:
+        break
 
 sys.exit(0)
 """
@@ -822,21 +1173,80 @@ sys.exit(0)
     
     def _read_process_output(self, pipe, is_error):
         """Read output from the script process"""
-        prefix = "ERROR: " if is_error else ""
+        fd = pipe.fileno()
         
-        for line in iter(pipe.readline, ''):
-            if not line:
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except OSError:
+                chunk = b""
+            
+            if not chunk:
                 break
-                
-            if line.startswith('[COMMAND]'):
-                # Handle command from script
-                self._handle_script_command(line)
-            elif line.startswith('[API]'):
-                # Handle API call from script
-                pass  # Just log it for now
-            else:
-                # Regular output
-                self._append_output(f"{prefix}{line}")
+            
+            self._feed_process_output(chunk, is_error)
+        
+        self._feed_process_output(b"", is_error, final=True)
+    
+    def _feed_process_output(self, chunk, is_error, final=False):
+        """Split a chunk of script output into lines and handle each line"""
+        text = self._output_decoders[is_error].decode(chunk, final)
+        pending = (self._output_partial[is_error] + text).replace("\r\n", "\n")
+        
+        lines = pending.split("\n")
+        partial = lines.pop()
+        
+        # Regular output of the whole chunk is appended in one go
+        output = []
+        
+        for line in lines:
+            self._handle_process_line(line + "\n", is_error, output)
+        
+        # Keep the unterminated tail until the rest of the line arrives
+        if final:
+            if partial:
+                self._handle_process_line(partial, is_error, output)
+            partial = ""
+        
+        self._output_partial[is_error] = partial
+        
+        self._flush_process_output(output)
+    
+    def _handle_process_line(self, line, is_error, output):
+        """Handle a line of output from the script process"""
+        prefix = "ERROR: " if is_error else ""
+        
+        if not is_error and self.script_done_marker and line.startswith(self.script_done_marker):
+            # The worker finished running the script
+            self._flush_process_output(output)
+            try:
+                status = int(line[len(self.script_done_marker):])
+            except ValueError:
+                logger.warning(f"Invalid script status line: {line.strip()}")
+                status = 1
+            
+            # A worker exits after an uncaught exception, don't send it the next script
+            if status != 0:
+                self.script_process_reusable = False
+            
+            if self.python_run_active:
+                self._finish_python_script(status)
+        elif line.startswith('[COMMAND]'):
+            # Handle command from script
+            self._flush_process_output(output)
+            self._handle_script_command(line)
+        elif line.startswith('[API]'):
+            # Handle API call from script
+            pass  # Just log it for now
+        else:
+            # Regular output
+            output.append(f"{prefix}{line}")
+    
+    def _flush_process_output(self, output):
+        """Append the collected lines of script output to the output panel"""
+        if output:
+            self._append_output("".join(output))
+            output.clear()
     
     def _script_print(self, *args, **kwargs):
         """Custom print function for scripts"""
@@ -851,20 +1261,39 @@ sys.exit(0)
         self._append_output(output)
     
     def _append_output(self, text):
-        """Append text to the output panel"""
+        """Append text to the output panel, can be called from any thread"""
+        # The output panel is updated in the UI thread
+        self.output_ready.emit(text)
+    
+    def _write_output(self, text):
+        """Write a batch of output to the output panel"""
         self.script_output += text
         
-        # Update the output text in the UI thread
-        self.output_text.setPlainText(self.script_output)
+        # Only follow the output if the user hasn't scrolled away from the end
+        scroll_bar = self.output_text.verticalScrollBar()
+        follow = scroll_bar.value() >= scroll_bar.maximum() - 2
         
-        # Scroll to the bottom
-        cursor = self.output_text.textCursor()
+        # Insert at the end of the document without moving the user's
+        # cursor or selection
+        cursor = QTextCursor(self.output_text.document())
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.output_text.setTextCursor(cursor)
+        cursor.insertText(text)
+        
+        # Scroll to the bottom
+        if follow:
+            scroll_bar.setValue(scroll_bar.maximum())
     
     def _script_finished(self):
         """Handle script execution finished"""
         self.script_running = False
+        
+        # Stop the timers of this run
+        if self.script_timeout_timer:
+            self.script_timeout_timer.stop()
+        
+        if self.resource_monitor_timer:
+            self.resource_monitor_timer.stop()
+        
         self.run_action.setEnabled(True)
         self.stop_action.setEnabled(False)
         self.status_bar.showMessage(f"Script '{self.current_script}' execution finished")
@@ -882,8 +1311,8 @@ sys.exit(0)
         if hasattr(self, 'resource_monitor_timer') and self.resource_monitor_timer.isActive():
             self.resource_monitor_timer.stop()
         
-        # Terminate the process if it's running
-        if hasattr(self, 'script_process') and self.script_process:
+        # Terminate the process if it's running a script
+        if self.python_run_active and self.script_process:
             try:
                 if force:
                     # Force kill the process
@@ -962,8 +1391,7 @@ sys.exit(0)
                 return
             
             # Export the script
-            with open(file_path, 'w') as f:
-                f.write(script["content"])
+            Path(file_path).write_text(script["content"], encoding="utf-8")
             
             self.status_bar.showMessage(f"Script exported to {file_path}", 3000)
             logger.info(f"Exported script: {self.current_script} to {file_path}")
@@ -982,14 +1410,10 @@ sys.exit(0)
             if not file_path:
                 return
             
-            # Determine the script type based on the file extension
-            if file_path.endswith(".py"):
-                script_type = "python"
-            else:
-                script_type = "simple"
-            
-            # Get the script name from the file name
-            name = Path(file_path).stem
+            # Determine the script type and name from the file name
+            root, ext = os.path.splitext(file_path)
+            script_type = _SCRIPT_EXT_MAP.get(ext, "simple")
+            name = os.path.basename(root)
             
             # Check if the name already exists
             if name in self.scripts:
@@ -1004,8 +1428,7 @@ sys.exit(0)
                     return
             
             # Read the script content
-            with open(file_path, 'r') as f:
-                content = f.read()
+            content = Path(file_path).read_text(encoding="utf-8")
             
             # Create or update the script
             self.scripts[name] = {
@@ -1033,16 +1456,11 @@ sys.exit(0)
         """Select a script in the list"""
         try:
             # Find the script item
-            for i in range(self.script_list.topLevelItemCount()):
-                category = self.script_list.topLevelItem(i)
-                
-                for j in range(category.childCount()):
-                    item = category.child(j)
-                    
-                    if item.data(0, Qt.ItemDataRole.UserRole) == name:
-                        # Select the item
-                        self.script_list.setCurrentItem(item)
-                        return
+            item = self.script_items.get(name)
+            
+            if item:
+                # Select the item
+                self.script_list.setCurrentItem(item)
         except Exception as e:
             logger.error(f"Error selecting script: {e}")
     
@@ -1113,6 +1531,7 @@ sys.exit(0)
                 # Update the scripts dictionary
                 self.scripts[new_name] = script
                 del self.scripts[old_name]
+                self.saved_hashes.pop(old_name, None)
                 
                 # Update the current script if needed
                 if self.current_script == old_name:
@@ -1182,7 +1601,7 @@ class NewScriptDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Please enter a name for the script.")
             return
         
-        if not re.match(r'^[a-zA-Z0-9_-]+$', name):
+        if not _NAME_RE.match(name):
             QMessageBox.warning(self, "Validation Error", "Script name can only contain letters, numbers, underscores, and hyphens.")
             return
         
@@ -1247,7 +1666,7 @@ class RenameScriptDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Please enter a name for the script.")
             return
         
-        if not re.match(r'^[a-zA-Z0-9_-]+$', name):
+        if not _NAME_RE.match(name):
             QMessageBox.warning(self, "Validation Error", "Script name can only contain letters, numbers, underscores, and hyphens.")
             return
         
@@ -1322,17 +1741,24 @@ class PythonSyntaxHighlighter(QSyntaxHighlighter):
 class PythonEditor(QPlainTextEdit):
     """Custom text editor with Python syntax highlighting"""
     
+    # Editor font and its space width, shared by all editors
+    _font = None
+    _space_advance = None
+    
     def __init__(self, parent=None):
         """Initialize the editor"""
         super().__init__(parent)
         
+        # Create the shared font with the first editor (needs a QApplication)
+        if PythonEditor._font is None:
+            PythonEditor._font = QFont("Courier New", 10)
+            PythonEditor._space_advance = QFontMetrics(PythonEditor._font).horizontalAdvance(' ')
+        
         # Set font
-        font = QFont("Courier New", 10)
-        self.setFont(font)
+        self.setFont(PythonEditor._font)
         
         # Set tab width
-        metrics = QFontMetrics(font)
-        self.setTabStopDistance(4 * metrics.horizontalAdvance(' '))
+        self.setTabStopDistance(4 * PythonEditor._space_advance)
         
         # Set syntax highlighter
         self.highlighter = PythonSyntaxHighlighter(self.document())
\ No newline at end of file
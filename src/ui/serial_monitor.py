@@ -10,21 +10,28 @@ import time
 import re
 import csv
 import json
+import heapq
+import itertools
+import operator
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 import os
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTextEdit, QComboBox, QCheckBox, QLineEdit, QTabWidget,
+    QPlainTextEdit, QComboBox, QCheckBox, QLineEdit, QTabWidget,
     QSplitter, QToolBar, QFileDialog, QMessageBox, QMenu,
     QSpinBox, QGroupBox, QFormLayout, QRadioButton
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize
-from PyQt6.QtGui import QAction, QIcon, QTextCursor, QColor, QTextCharFormat, QFont
+from PyQt6.QtGui import QAction, QIcon, QColor, QTextCharFormat, QFont
 
 logger = logging.getLogger(__name__)
 
+# ANSI escape sequences (colors, cursor movement) sent by some devices
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
 class SerialMonitor(QWidget):
     """Widget for displaying and managing serial communication"""
     
@@ -35,20 +42,42 @@ class SerialMonitor(QWidget):
         self.app = app
         
         # Data storage
-        self.log_data = {}  # port -> list of (timestamp, data) tuples
+        self.log_data = {}  # port -> deque of (timestamp, data, casefolded data, stamped data, sequence) tuples
+        self._sequence = itertools.count()  # Arrival order of lines across all ports
         self.max_log_size = 10000  # Maximum number of lines to keep in memory
         
+        # Port-specific text edits
+        self._text_edits = {}  # port -> QPlainTextEdit
+        
+        # Compiled pattern for the current filter
+        self._filter_re = None
+        self._last_filter = ""
+        
         # Auto-scroll flag
         self.auto_scroll = True
         
+        # Show timestamps flag
+        self._show_ts = True
+        
         # Timestamp format
         self.timestamp_format = "%Y-%m-%d %H:%M:%S.%f"
         
+        # Log entries waiting for the next flush
+        self._pending = []  # list of (port, entry) tuples
+        
+        # Hidden views that missed lines (None is the "All Devices" view)
+        self._stale_views = set()
+        
         # Initialize UI components
         self._init_ui()
         
         # Connect signals
         self._connect_signals()
+        
+        # Flush buffered lines to the views in batches
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._flush)
+        self._flush_timer.start(50)
     
     def _init_ui(self):
         """Initialize the UI components"""
@@ -81,6 +110,7 @@ class SerialMonitor(QWidget):
         # Show timestamps checkbox
         self.show_timestamps_check = QCheckBox("Show Timestamps")
         self.show_timestamps_check.setChecked(True)
+        self.show_timestamps_check.stateChanged.connect(self._toggle_timestamps)
         toolbar.addWidget(self.show_timestamps_check)
         
         toolbar.addSeparator()
@@ -92,13 +122,20 @@ class SerialMonitor(QWidget):
         # Filter input
         self.filter_input = QLineEdit()
         self.filter_input.setPlaceholderText("Filter text...")
-        self.filter_input.textChanged.connect(self._apply_filter)
         toolbar.addWidget(self.filter_input)
         
+        # Apply the filter once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter_input.textChanged.connect(lambda _: self._filter_timer.start())
+        
         # Tab widget for multiple devices
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self._close_tab)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         layout.addWidget(self.tab_widget)
         
         # Add "All Devices" tab
@@ -108,10 +145,12 @@ class SerialMonitor(QWidget):
         all_tab_layout = QVBoxLayout()
         self.all_devices_tab.setLayout(all_tab_layout)
         
-        self.all_devices_text = QTextEdit()
+        self.all_devices_text = QPlainTextEdit()
         self.all_devices_text.setReadOnly(True)
-        self.all_devices_text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.all_devices_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         self.all_devices_text.setFont(QFont("Courier New", 10))
+        self.all_devices_text.setUndoRedoEnabled(False)
+        self.all_devices_text.setMaximumBlockCount(self.max_log_size)
         all_tab_layout.addWidget(self.all_devices_text)
     
     def _connect_signals(self):
@@ -125,39 +164,98 @@ class SerialMonitor(QWidget):
         """Add data from a device to the monitor"""
         try:
             # Create a tab for this port if it doesn't exist
-            if not self._has_tab_for_port(port):
+            if port not in self._text_edits:
                 self._create_tab_for_port(port)
             
-            # Add to the log data
+            # Add to the log data (the deque drops the oldest lines itself)
             if port not in self.log_data:
-                self.log_data[port] = []
+                self.log_data[port] = deque(maxlen=self.max_log_size)
             
-            self.log_data[port].append((timestamp, data))
+            # Strip terminal escape sequences once at ingest
+            if "\x1b" in data:
+                data = _ANSI_RE.sub("", data)
             
-            # Trim log data if needed
-            if len(self.log_data[port]) > self.max_log_size:
-                self.log_data[port] = self.log_data[port][-self.max_log_size:]
+            # Keep the filter key and display text with the line so redraws don't rebuild them
+            key = data.casefold()
+            if key == data:
+                # Share the string for lines that are already casefolded
+                key = data
+            entry = (timestamp, data, key, f"[{timestamp}] {data}", next(self._sequence))
+            self.log_data[port].append(entry)
             
-            # Format the data for display
-            display_text = self._format_data_for_display(port, data, timestamp)
+            # Lines hidden by the active filter stay in the log only
+            if self._filter_re and not self._filter_re.search(key):
+                return
             
-            # Add to the port-specific tab
-            text_edit = self.tab_widget.findChild(QTextEdit, f"text_edit_{port}")
-            if text_edit:
-                text_edit.append(display_text)
-                
-                # Auto-scroll if enabled
-                if self.auto_scroll:
-                    text_edit.moveCursor(QTextCursor.MoveOperation.End)
+            # Queue for the next flush
+            self._pending.append((port, entry))
+        except Exception as e:
+            logger.error(f"Error adding data to monitor: {e}")
+    
+    def _flush(self):
+        """Append buffered lines to the visible view"""
+        try:
+            if not self._pending:
+                return
+            
+            pending = self._pending
+            self._pending = []
+            
+            view = self._current_view()
+            index = self._display_index()
             
-            # Add to the "All Devices" tab
-            self.all_devices_text.append(f"[{port}] {display_text}")
+            # Only the visible view is updated, the others are rebuilt when shown
+            if view is None:
+                text_edit = self.all_devices_text
+                lines = [f"[{port}] {entry[index]}" for port, entry in pending]
+            else:
+                self._stale_views.add(None)
+                text_edit = self._text_edits.get(view)
+                lines = [entry[index] for port, entry in pending if port == view]
+            
+            self._stale_views.update(port for port, _ in pending if port != view)
+            
+            # A stale view already has these lines in its next rebuild
+            if not text_edit or not lines or view in self._stale_views:
+                return
+            
+            # One append for the whole batch
+            text_edit.appendPlainText("\n".join(lines))
             
             # Auto-scroll if enabled
             if self.auto_scroll:
-                self.all_devices_text.moveCursor(QTextCursor.MoveOperation.End)
+                scroll_bar = text_edit.verticalScrollBar()
+                scroll_bar.setValue(scroll_bar.maximum())
         except Exception as e:
-            logger.error(f"Error adding data to monitor: {e}")
+            logger.error(f"Error flushing monitor data: {e}")
+    
+    def _discard_pending(self):
+        """Drop buffered lines that a full redraw already covers"""
+        self._pending = []
+    
+    def _current_view(self):
+        """Get the port of the visible tab, or None for the "All Devices" tab"""
+        index = self.tab_widget.currentIndex()
+        if index <= 0:
+            return None
+        return self.tab_widget.tabText(index)
+    
+    def _on_tab_changed(self, index):
+        """Bring the newly visible view up to date"""
+        try:
+            # Lines queued so far are not in the previously visible view
+            self._flush()
+            
+            view = self._current_view()
+            if view in self._stale_views:
+                self._rebuild_view(view)
+            
+            # The "All Devices" view duplicates every port, so only keep it while shown
+            if view is not None:
+                self.all_devices_text.clear()
+                self._stale_views.add(None)
+        except Exception as e:
+            logger.error(f"Error switching monitor tab: {e}")
     
     def clear_terminal(self):
         """Clear the terminal"""
@@ -166,13 +264,13 @@ class SerialMonitor(QWidget):
             self.all_devices_text.clear()
             
             # Clear all port-specific tabs
-            for i in range(1, self.tab_widget.count()):
-                text_edit = self.tab_widget.widget(i).findChild(QTextEdit)
-                if text_edit:
-                    text_edit.clear()
+            for text_edit in self._text_edits.values():
+                text_edit.clear()
             
             # Clear the log data
             self.log_data = {}
+            self._discard_pending()
+            self._stale_views.clear()
             
             logger.info("Terminal cleared")
         except Exception as e:
@@ -194,44 +292,49 @@ class SerialMonitor(QWidget):
             logger.error(f"Error exporting logs: {e}")
             return False
     
+    def _iter_log_rows(self):
+        """Yield (port, timestamp, data) for every logged line"""
+        for port, data_list in self.log_data.items():
+            for timestamp, data, _, _, _ in data_list:
+                yield port, timestamp, data
+    
     def _export_csv(self, file_path):
         """Export logs to a CSV file"""
-        with open(file_path, 'w', newline='') as csvfile:
+        with open(file_path, 'w', newline='', buffering=1 << 16) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header
             writer.writerow(["Port", "Timestamp", "Data"])
             
-            # Write data
-            for port, data_list in self.log_data.items():
-                for timestamp, data in data_list:
-                    writer.writerow([port, timestamp, data])
+            # Stream the data without building a row list
+            writer.writerows(self._iter_log_rows())
     
     def _export_json(self, file_path):
         """Export logs to a JSON file"""
-        # Convert log data to a serializable format
-        json_data = {}
-        
-        for port, data_list in self.log_data.items():
-            json_data[port] = [{"timestamp": ts, "data": data} for ts, data in data_list]
-        
-        # Write to file
-        with open(file_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        # Stream one record at a time instead of building a copy of the log
+        with open(file_path, 'w', buffering=1 << 16) as f:
+            f.write("{")
+            
+            for i, (port, data_list) in enumerate(self.log_data.items()):
+                f.write(f'{"," if i else ""}\n  {json.dumps(port)}: [')
+                
+                separator = "\n    "
+                for timestamp, data, _, _, _ in data_list:
+                    f.write(separator)
+                    f.write(json.dumps({"timestamp": timestamp, "data": data}))
+                    separator = ",\n    "
+                
+                f.write("\n  ]" if data_list else "]")
+            
+            f.write("\n}\n" if self.log_data else "}\n")
     
     def _export_text(self, file_path):
         """Export logs to a text file"""
-        with open(file_path, 'w') as f:
-            for port, data_list in self.log_data.items():
-                for timestamp, data in data_list:
-                    f.write(f"[{port}] [{timestamp}] {data}\n")
-    
-    def _has_tab_for_port(self, port):
-        """Check if a tab exists for the given port"""
-        for i in range(self.tab_widget.count()):
-            if self.tab_widget.tabText(i) == port:
-                return True
-        return False
+        with open(file_path, 'w', buffering=1 << 16) as f:
+            f.writelines(
+                f"[{port}] [{timestamp}] {data}\n"
+                for port, timestamp, data in self._iter_log_rows()
+            )
     
     def _create_tab_for_port(self, port):
         """Create a new tab for the given port"""
@@ -242,12 +345,16 @@ class SerialMonitor(QWidget):
             tab.setLayout(tab_layout)
             
             # Create a text edit for the tab
-            text_edit = QTextEdit()
+            text_edit = QPlainTextEdit()
             text_edit.setObjectName(f"text_edit_{port}")
             text_edit.setReadOnly(True)
-            text_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+            text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
             text_edit.setFont(QFont("Courier New", 10))
+            text_edit.setUndoRedoEnabled(False)
+            text_edit.setMaximumBlockCount(self.max_log_size)
             tab_layout.addWidget(text_edit)
+            self._text_edits[port] = text_edit
+            self._stale_views.add(port)
             
             # Add the tab
             self.tab_widget.addTab(tab, port)
@@ -268,87 +375,129 @@ class SerialMonitor(QWidget):
             
             # Remove the tab
             self.tab_widget.removeTab(index)
+            self._text_edits.pop(port, None)
+            self._stale_views.discard(port)
             
             logger.debug(f"Closed tab for port {port}")
         except Exception as e:
             logger.error(f"Error closing tab: {e}")
     
-    def _format_data_for_display(self, port, data, timestamp):
-        """Format data for display in the terminal"""
-        # Add timestamp if enabled
-        if self.show_timestamps_check.isChecked():
-            return f"[{timestamp}] {data}"
-        else:
-            return data
+    def _display_index(self):
+        """Get the log entry field shown in the terminal"""
+        # Stamped data if timestamps are enabled
+        return 3 if self._show_ts else 1
     
     def _toggle_auto_scroll(self, state):
         """Toggle auto-scrolling"""
         self.auto_scroll = state == Qt.CheckState.Checked
     
+    @staticmethod
+    def _compile_filter(filter_text):
+        """Compile the filter into a case-insensitive substring pattern"""
+        # Lines are matched against their casefolded form stored at ingest
+        return re.compile(re.escape(filter_text.casefold()))
+    
+    def _toggle_timestamps(self, state):
+        """Toggle timestamps in the displayed data"""
+        try:
+            self._show_ts = self.show_timestamps_check.isChecked()
+            self._rebuild_views()
+        except Exception as e:
+            logger.error(f"Error toggling timestamps: {e}")
+    
     def _apply_filter(self):
         """Apply the filter to the displayed data"""
         try:
             filter_text = self.filter_input.text()
             
+            # Nothing to redraw if the filter didn't change
+            if filter_text == self._last_filter:
+                return
+            self._last_filter = filter_text
+            
             if not filter_text:
                 # No filter, show all data
+                self._filter_re = None
                 self._refresh_display()
                 return
             
-            # Apply filter to all tabs
-            for port, data_list in self.log_data.items():
-                # Get the text edit for this port
-                text_edit = self.tab_widget.findChild(QTextEdit, f"text_edit_{port}")
-                
-                if text_edit:
-                    # Clear the text edit
-                    text_edit.clear()
-                    
-                    # Add only matching lines
-                    for timestamp, data in data_list:
-                        if filter_text.lower() in data.lower():
-                            display_text = self._format_data_for_display(port, data, timestamp)
-                            text_edit.append(display_text)
-            
-            # Apply filter to "All Devices" tab
-            self.all_devices_text.clear()
+            self._filter_re = self._compile_filter(filter_text)
             
-            for port, data_list in self.log_data.items():
-                for timestamp, data in data_list:
-                    if filter_text.lower() in data.lower():
-                        display_text = self._format_data_for_display(port, data, timestamp)
-                        self.all_devices_text.append(f"[{port}] {display_text}")
+            # Show only matching lines
+            self._rebuild_views()
         except Exception as e:
             logger.error(f"Error applying filter: {e}")
     
     def _refresh_display(self):
         """Refresh the display with all data"""
         try:
-            # Clear all text edits
-            self.all_devices_text.clear()
-            
-            for i in range(1, self.tab_widget.count()):
-                text_edit = self.tab_widget.widget(i).findChild(QTextEdit)
-                if text_edit:
-                    text_edit.clear()
-            
-            # Re-add all data
-            for port, data_list in self.log_data.items():
-                # Get the text edit for this port
-                text_edit = self.tab_widget.findChild(QTextEdit, f"text_edit_{port}")
-                
-                for timestamp, data in data_list:
-                    display_text = self._format_data_for_display(port, data, timestamp)
-                    
-                    # Add to port-specific tab
-                    if text_edit:
-                        text_edit.append(display_text)
-                    
-                    # Add to "All Devices" tab
-                    self.all_devices_text.append(f"[{port}] {display_text}")
+            # Show all lines
+            self._rebuild_views()
         except Exception as e:
             logger.error(f"Error refreshing display: {e}")
     
+    def _matching_lines(self, port):
+        """Get the display lines of a port that pass the filter"""
+        index = self._display_index()
+        data_list = self.log_data.get(port, ())
+        
+        if not self._filter_re:
+            return [entry[index] for entry in data_list]
+        
+        search = self._filter_re.search
+        return [entry[index] for entry in data_list if search(entry[2])]
+    
+    def _newest_matching_lines(self, port):
+        """Yield (sequence, "All Devices" line) for a port's lines that pass the filter, newest first"""
+        index = self._display_index()
+        search = self._filter_re.search if self._filter_re else None
+        
+        for entry in reversed(self.log_data[port]):
+            if search is None or search(entry[2]):
+                yield entry[4], f"[{port}] {entry[index]}"
+    
+    def _all_devices_lines(self):
+        """Get the last lines of all ports that pass the filter, in arrival order"""
+        # Merge the ports newest first and stop once the view is full
+        merged = heapq.merge(
+            *(self._newest_matching_lines(port) for port in self.log_data),
+            key=operator.itemgetter(0), reverse=True
+        )
+        lines = [line for _, line in itertools.islice(merged, self.max_log_size)]
+        lines.reverse()
+        return lines
+    
+    def _rebuild_view(self, view):
+        """Replace the contents of a port view, or the "All Devices" view for None"""
+        self._stale_views.discard(view)
+        
+        if view is None:
+            text_edit = self.all_devices_text
+            text = "\n".join(self._all_devices_lines())
+        elif view in self._text_edits:
+            text_edit = self._text_edits[view]
+            text = "\n".join(self._matching_lines(view))
+        else:
+            return
+        
+        # One setPlainText per view, painted once when it is done
+        text_edit.setUpdatesEnabled(False)
+        text_edit.blockSignals(True)
+        try:
+            text_edit.setPlainText(text)
+        finally:
+            text_edit.blockSignals(False)
+            text_edit.setUpdatesEnabled(True)
+            text_edit.viewport().update()
+    
+    def _rebuild_views(self):
+        """Rebuild the visible view and mark the hidden ones for rebuilding when shown"""
+        self._discard_pending()
+        
+        view = self._current_view()
+        self._stale_views = set(self._text_edits) | {None}
+        self._rebuild_view(view)
+    
     def _save_log(self):
         """Save the log to a file"""
         try:
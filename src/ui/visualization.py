@@ -9,12 +9,14 @@ import logging
 import time
 import re
 import json
-import csv
 from datetime import datetime
 from pathlib import Path
 import os
 import math
 import random
+import operator
+import functools
+from collections import deque
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
@@ -24,14 +26,186 @@ from PyQt6.QtWidgets import (
     QDialog, QDialogButtonBox, QTableWidget, QTableWidgetItem,
     QHeaderView, QListWidget, QListWidgetItem, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QRectF
-from PyQt6.QtGui import QAction, QIcon, QColor, QPen, QBrush, QPainter, QPainterPath
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QRectF, QPointF, QPoint, QRect
+from PyQt6.QtGui import (
+    QAction, QIcon, QColor, QPen, QBrush, QPainter, QPainterPath, QPixmap, QFont,
+    QStaticText, QTransform, QRegion
+)
 
 import pyqtgraph as pg
 import numpy as np
 
+# orjson is optional, JSON exports fall back to the json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numba is optional, ring buffer writes use NumPy indexing without it
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# PyOpenGL is optional, line charts use the raster backend without it
+try:
+    import OpenGL  # noqa: F401
+    _HAVE_OPENGL = True
+except ImportError:
+    _HAVE_OPENGL = False
+
 logger = logging.getLogger(__name__)
 
+
+def _parse_value(text):
+    """Parse a matched value, NaN if it is not a number"""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _ring_write(ts, val, head, timestamps, values):
+        """Write samples into a mirrored ring buffer and return the new head"""
+        size = len(ts) // 2
+        n = len(values)
+        for i in range(n):
+            j = (head + i) % size
+            ts[j] = ts[j + size] = timestamps[i]
+            val[j] = val[j + size] = values[i]
+        return (head + n) % size
+else:
+    def _ring_write(ts, val, head, timestamps, values):
+        """Write samples into a mirrored ring buffer and return the new head"""
+        size = len(ts) // 2
+        n = len(values)
+        index = (head + np.arange(n)) % size
+        ts[index] = timestamps
+        ts[index + size] = timestamps
+        val[index] = values
+        val[index + size] = values
+        return (head + n) % size
+
+
+# Cosine and sine of the gauge needle angle over its 270 degree sweep, from 135 degrees
+# at the minimum value down to -135 degrees at the maximum
+_NEEDLE_STEPS = 1024
+_NEEDLE_COS = [math.cos(math.radians(135 - 270 * step / (_NEEDLE_STEPS - 1))) for step in range(_NEEDLE_STEPS)]
+_NEEDLE_SIN = [math.sin(math.radians(135 - 270 * step / (_NEEDLE_STEPS - 1))) for step in range(_NEEDLE_STEPS)]
+
+# Number of recent values shown by a bar chart
+_BAR_COUNT = 10
+
+
+@functools.lru_cache(maxsize=256)
+def _value_static_text(tenths, units, font_description):
+    """Get the laid out gauge text for a value given in whole tenths"""
+    text = f"{tenths / 10:.1f}"
+    if units:
+        text += f" {units}"
+    
+    font = QFont()
+    font.fromString(font_description)
+    
+    static_text = QStaticText(text)
+    static_text.setTextFormat(Qt.TextFormat.PlainText)
+    static_text.prepare(QTransform(), font)
+    return static_text
+
+
+class DataSeries:
+    """Samples and chart of one visualization"""
+    
+    __slots__ = (
+        "config", "update_fn", "port", "pattern", "extract", "scale",
+        "ts", "val", "head", "count", "written", "last_drawn",
+        "t0", "wall_t0", "last_update", "plot", "bar_x", "bar_y", "bar_count"
+    )
+    
+    def __init__(self, config, size):
+        """Initialize the data series"""
+        self.config = config
+        self.update_fn = None  # chart update function, set by the panel
+        self.port = config["port"]
+        
+        # Compile the extraction pattern once for all incoming data
+        self.pattern = re.compile(config["pattern"]) if config["pattern"] else None
+        
+        # Fetch the value text from a match, the first group if the pattern has one
+        self.extract = operator.itemgetter(1 if self.pattern and self.pattern.groups else 0)
+        self.scale = config.get("scale")
+        
+        # Samples are kept in fixed-size ring buffers
+        self.ts = self._alloc_ring(size)
+        self.val = self._alloc_ring(size)
+        self.head = 0  # next write position
+        self.count = 0
+        self.written = 0  # samples written so far
+        self.last_drawn = 0  # value of written at the last chart update
+        
+        # Sample times are seconds since t0, wall_t0 is the wall-clock time at t0 for exports
+        self.t0 = time.perf_counter()
+        self.wall_t0 = time.time()
+        self.last_update = 0.0
+        
+        # Line, bar graph or gauge showing the samples
+        self.plot = None
+        
+        # Bar positions and heights, reused by every bar chart update
+        self.bar_x = None
+        self.bar_y = None
+        self.bar_count = 0  # bars currently drawn
+    
+    @staticmethod
+    def _alloc_ring(size):
+        """Allocate a ring buffer for size samples"""
+        # Every sample is stored twice, at i and i + size, so the last size
+        # samples are always one contiguous slice
+        return np.empty(2 * size, dtype=np.float64)
+    
+    def append(self, timestamps, values):
+        """Write samples into the ring buffer, overwriting the oldest when full"""
+        size = len(self.ts) // 2
+        
+        # Only the last size samples can survive the write
+        timestamps = timestamps[-size:]
+        values = values[-size:]
+        n = len(values)
+        
+        self.head = _ring_write(self.ts, self.val, self.head, timestamps, values)
+        self.count = min(self.count + n, size)
+        self.written += n
+    
+    def data(self):
+        """Get views of the timestamps and values in chronological order"""
+        size = len(self.ts) // 2
+        count = self.count
+        
+        # Not wrapped yet, the samples start at the beginning of the buffer
+        start = self.head if count == size else 0
+        
+        return self.ts[start:start + count], self.val[start:start + count]
+    
+    def latest(self):
+        """Get the most recent value"""
+        return float(self.val[self.head - 1])
+    
+    def resize(self, size):
+        """Reallocate the ring buffers, keeping the most recent samples"""
+        ts, val = self.data()
+        count = min(len(ts), size)
+        
+        self.ts = self._alloc_ring(size)
+        self.val = self._alloc_ring(size)
+        self.ts[:count] = self.ts[size:size + count] = ts[len(ts) - count:]
+        self.val[:count] = self.val[size:size + count] = val[len(val) - count:]
+        self.head = count % size
+        self.count = count
+        self.last_drawn = None  # redraw with the new length
+
+
 class VisualizationPanel(QWidget):
     """Panel for displaying data visualizations"""
     
@@ -42,12 +216,23 @@ class VisualizationPanel(QWidget):
         self.app = app
         
         # Data storage
-        self.data_series = {}  # name -> {data, config}
+        self.data_series = {}  # name -> DataSeries
+        self._series_by_port = {}  # port or "all" -> list of DataSeries
+        
+        # Connections whose data_received signal is connected to this panel
+        self._connections = {}  # port -> SerialConnection
+        
+        # Data received from the serial threads, parsed on the update timer
+        self._inbox = deque(maxlen=65536)  # (port, data, perf_counter time) tuples
         
         # Chart configuration
         self.max_data_points = 1000
         self.update_interval = 100  # ms
         
+        # Pens and brushes shared by charts of the same color
+        self._pens = {}  # (color, width) -> QPen
+        self._brushes = {}  # color -> QBrush
+        
         # Initialize UI components
         self._init_ui()
         
@@ -55,7 +240,9 @@ class VisualizationPanel(QWidget):
         self._connect_signals()
         
         # Update timer
+        self._updating = False
         self.update_timer = QTimer(self)
+        self.update_timer.setTimerType(self._timer_type(self.update_interval))
         self.update_timer.timeout.connect(self._update_charts)
         self.update_timer.start(self.update_interval)
     
@@ -110,13 +297,44 @@ class VisualizationPanel(QWidget):
         
         # Add a welcome tab
         self._add_welcome_tab()
+        
+        # Bring a chart up to date when its tab is shown
+        self.tab_widget.currentChanged.connect(lambda _: self._update_charts())
     
     def _connect_signals(self):
         """Connect signals from the serial manager"""
         # Connect to the serial manager's signals
         if hasattr(self.app, 'serial_manager'):
-            for port, connection in self.app.serial_manager.get_connections().items():
-                connection.data_received.connect(self._process_data)
+            self.app.serial_manager.connection_added.connect(self._on_connection_added)
+            self.app.serial_manager.connection_removed.connect(self._on_connection_removed)
+            
+            for port in list(self.app.serial_manager.get_connections()):
+                self._on_connection_added(port)
+    
+    def _on_connection_added(self, port):
+        """Connect to a port's data, once per port"""
+        if port in self._connections:
+            return
+        
+        connection = self.app.serial_manager.get_connection(port)
+        if connection is None:
+            return
+        
+        # Direct connection, _process_data only queues the data for the update timer
+        connection.data_received.connect(self._process_data, Qt.ConnectionType.DirectConnection)
+        self._connections[port] = connection
+    
+    def _on_connection_removed(self, port):
+        """Forget a closed port"""
+        # The manager drops the connection before announcing it, so use the one connected here
+        connection = self._connections.pop(port, None)
+        if connection is None:
+            return
+        
+        try:
+            connection.data_received.disconnect(self._process_data)
+        except (TypeError, RuntimeError) as e:
+            logger.debug(f"Error disconnecting {port}: {e}")
     
     def _add_welcome_tab(self):
         """Add a welcome tab with instructions"""
@@ -181,12 +399,20 @@ class VisualizationPanel(QWidget):
                 name = f"{name} ({i})"
                 config["name"] = name
             
-            # Create the data series
-            self.data_series[name] = {
-                "data": [],
-                "config": config,
-                "last_update": time.time()
+            # Chart update function by type
+            update_functions = {
+                "line": self._update_line_chart,
+                "bar": self._update_bar_chart,
+                "gauge": self._update_gauge
             }
+            if config["type"] not in update_functions:
+                raise ValueError(f"Unknown chart type: {config['type']}")
+            
+            # Create the data series
+            series = DataSeries(config, self.max_data_points)
+            series.update_fn = update_functions[config["type"]]
+            self.data_series[name] = series
+            self._index_series()
             
             # Create the visualization tab
             tab = QWidget()
@@ -198,10 +424,8 @@ class VisualizationPanel(QWidget):
                 chart = self._create_line_chart(name, config)
             elif config["type"] == "bar":
                 chart = self._create_bar_chart(name, config)
-            elif config["type"] == "gauge":
-                chart = self._create_gauge(name, config)
             else:
-                raise ValueError(f"Unknown chart type: {config['type']}")
+                chart = self._create_gauge(name, config)
             
             # Add the chart to the tab
             tab_layout.addWidget(chart)
@@ -231,11 +455,23 @@ class VisualizationPanel(QWidget):
         # Add a grid
         plot.showGrid(x=True, y=True)
         
+        # Only draw the visible range, reduced to peaks when there are more points than pixels
+        plot.setDownsampling(auto=True, mode="peak")
+        plot.setClipToView(True)
+        
+        # Render on the GPU if enabled, pyqtgraph draws OpenGL curves 1 px wide
+        if _HAVE_OPENGL and self.app.config.get("visualization", "use_opengl", False):
+            pg.setConfigOption("enableExperimental", True)
+            plot_widget.useOpenGL(True)
+            pen_width = 1
+        else:
+            pen_width = 2
+        
         # Create the line
-        line = plot.plot(pen=pg.mkPen(color=config["color"], width=2))
+        line = plot.plot(pen=self._get_pen(config["color"], pen_width))
         
         # Store the line in the data series
-        self.data_series[name]["line"] = line
+        self.data_series[name].plot = line
         
         return plot_widget
     
@@ -256,14 +492,30 @@ class VisualizationPanel(QWidget):
         plot.showGrid(x=True, y=True)
         
         # Create the bar graph
-        bar_graph = pg.BarGraphItem(x=[], height=[], width=0.6, brush=config["color"])
+        bar_graph = pg.BarGraphItem(x=[], height=[], width=0.6, brush=self._get_brush(config["color"]))
         plot.addItem(bar_graph)
         
         # Store the bar graph in the data series
-        self.data_series[name]["bar_graph"] = bar_graph
+        series = self.data_series[name]
+        series.plot = bar_graph
+        series.bar_x = np.arange(_BAR_COUNT, dtype=np.float64)
+        series.bar_y = np.empty(_BAR_COUNT, dtype=np.float64)
         
         return plot_widget
     
+    def _get_pen(self, color, width):
+        """Get a cached pen for the color and width"""
+        key = (color, width)
+        if key not in self._pens:
+            self._pens[key] = pg.mkPen(color=color, width=width)
+        return self._pens[key]
+    
+    def _get_brush(self, color):
+        """Get a cached brush for the color"""
+        if color not in self._brushes:
+            self._brushes[color] = pg.mkBrush(color)
+        return self._brushes[color]
+    
     def _create_gauge(self, name, config):
         """Create a gauge"""
         # Create a custom gauge widget
@@ -276,7 +528,7 @@ class VisualizationPanel(QWidget):
         )
         
         # Store the gauge in the data series
-        self.data_series[name]["gauge"] = gauge
+        self.data_series[name].plot = gauge
         
         return gauge
     
@@ -289,6 +541,7 @@ class VisualizationPanel(QWidget):
             # Remove the data series
             if name in self.data_series:
                 del self.data_series[name]
+                self._index_series()
             
             # Remove the tab
             self.tab_widget.removeTab(index)
@@ -298,110 +551,149 @@ class VisualizationPanel(QWidget):
             logger.error(f"Error closing visualization: {e}")
     
     def _process_data(self, port, data, timestamp):
-        """Process incoming data for visualizations"""
+        """Queue incoming data for visualizations"""
+        # Called directly on the serial thread, deque appends are thread-safe
+        self._inbox.append((port, data, time.perf_counter()))
+    
+    def _drain_inbox(self):
+        """Parse all queued data into the data series"""
+        chunks = {}  # port -> (list of data, list of receive times)
+        
+        while self._inbox:
+            port, data, received = self._inbox.popleft()
+            texts, times = chunks.setdefault(port, ([], []))
+            texts.append(data)
+            times.append(received)
+        
+        for port, (texts, times) in chunks.items():
+            self._parse_into_series(port, texts, times)
+    
+    def _index_series(self):
+        """Group the data series by their configured port"""
+        self._series_by_port = {}
+        for series in self.data_series.values():
+            self._series_by_port.setdefault(series.port, []).append(series)
+    
+    def _parse_into_series(self, port, texts, times):
+        """Extract values from a port's queued data into its data series"""
         try:
-            # Check each data series
-            for name, series in self.data_series.items():
-                config = series["config"]
+            # Only the data series configured for this port or for all ports
+            port_series = self._series_by_port.get(port, []) + self._series_by_port.get("all", [])
+            if not port_series:
+                return
+            
+            times = np.asarray(times, dtype=np.float64)
+            
+            for series in port_series:
+                # Search each queued line on its own, taking its first match
+                pattern = series.pattern
+                if not pattern:
+                    continue
                 
-                # Check if this data is from the configured port
-                if config["port"] != "all" and config["port"] != port:
+                matches = [(index, match) for index, match in enumerate(map(pattern.search, texts)) if match]
+                if not matches:
                     continue
                 
-                # Try to extract the value using the regex pattern
-                if config["pattern"]:
-                    match = re.search(config["pattern"], data)
-                    
-                    if match:
-                        # Extract the value
-                        try:
-                            if match.groups():
-                                value = float(match.group(1))
-                            else:
-                                value = float(match.group(0))
-                            
-                            # Apply scaling if configured
-                            if config.get("scale"):
-                                value = value * config["scale"]
-                            
-                            # Add to the data series
-                            timestamp = time.time()
-                            series["data"].append((timestamp, value))
-                            series["last_update"] = timestamp
-                            
-                            # Trim the data series if needed
-                            if len(series["data"]) > self.max_data_points:
-                                series["data"] = series["data"][-self.max_data_points:]
-                        except (ValueError, IndexError) as e:
-                            logger.debug(f"Error extracting value from match: {e}")
+                values = np.fromiter(
+                    (_parse_value(series.extract(match)) for _, match in matches),
+                    dtype=np.float64, count=len(matches)
+                )
+                line_index = np.fromiter(
+                    (index for index, _ in matches),
+                    dtype=np.int64, count=len(matches)
+                )
+                
+                # Drop matches that are not finite numbers, line charts skip pyqtgraph's finite check
+                valid = np.isfinite(values)
+                if not valid.any():
+                    continue
+                values = values[valid]
+                
+                # Apply scaling if configured
+                if series.scale:
+                    values *= series.scale
+                
+                # Add to the data series, stamped with the receive time of their line
+                timestamps = times[line_index[valid]] - series.t0
+                series.append(timestamps, values)
+                series.last_update = timestamps[-1]
         except Exception as e:
             logger.error(f"Error processing data for visualization: {e}")
     
     def _update_charts(self):
         """Update all charts with the latest data"""
+        # Don't start another update while one is still running (e.g. from a nested event loop)
+        if self._updating:
+            return
+        self._updating = True
+        
         try:
-            for name, series in self.data_series.items():
-                config = series["config"]
-                data = series["data"]
-                
-                if not data:
-                    continue
-                
-                # Update based on chart type
-                if config["type"] == "line":
-                    self._update_line_chart(name, series)
-                elif config["type"] == "bar":
-                    self._update_bar_chart(name, series)
-                elif config["type"] == "gauge":
-                    self._update_gauge(name, series)
+            # Parse the data received since the last update
+            self._drain_inbox()
+            
+            # Only the chart on the current tab is drawn, the others catch up when shown
+            name = self.tab_widget.tabText(self.tab_widget.currentIndex())
+            series = self.data_series.get(name)
+            
+            # Skip series without new data since the last update
+            if series is None or not series.count or series.written == series.last_drawn:
+                return
+            series.last_drawn = series.written
+            
+            # Update with the function chosen when the chart was created
+            series.update_fn(name, series)
         except Exception as e:
             logger.error(f"Error updating charts: {e}")
+        finally:
+            self._updating = False
     
     def _update_line_chart(self, name, series):
         """Update a line chart"""
         try:
-            line = series.get("line")
-            data = series["data"]
+            line = series.plot
             
-            if line and data:
-                # Extract x and y values
-                x_values = [d[0] - data[0][0] for d in data]  # Relative time
-                y_values = [d[1] for d in data]
+            if line and series.count:
+                # Sample times are already relative, so both arrays are plotted as views
+                x_values, y_values = series.data()
                 
-                # Update the line
-                line.setData(x_values, y_values)
+                # Update the line, NaN matches are dropped at ingest so the finite check is skipped
+                line.setData(x=x_values, y=y_values, skipFiniteCheck=True, connect="all")
         except Exception as e:
             logger.error(f"Error updating line chart: {e}")
     
     def _update_bar_chart(self, name, series):
         """Update a bar chart"""
         try:
-            bar_graph = series.get("bar_graph")
-            data = series["data"]
+            bar_graph = series.plot
             
-            if bar_graph and data:
+            if bar_graph and series.count:
                 # Use the last N values
-                n = min(10, len(data))
-                recent_data = data[-n:]
+                n = min(_BAR_COUNT, series.count)
+                _, values = series.data()
+                recent = values[-n:]
+                
+                # Nothing to redraw if the bars didn't change
+                bar_y = series.bar_y
+                if n == series.bar_count and np.array_equal(recent, bar_y[:n]):
+                    return
                 
-                # Extract x and y values
-                x_values = list(range(len(recent_data)))
-                y_values = [d[1] for d in recent_data]
+                # Fill the preallocated arrays instead of building new ones
+                np.copyto(bar_y[:n], recent)
+                series.bar_count = n
                 
                 # Update the bar graph
-                bar_graph.setOpts(x=x_values, height=y_values)
+                bar_graph.setOpts(x=series.bar_x[:n], height=bar_y[:n])
         except Exception as e:
             logger.error(f"Error updating bar chart: {e}")
     
     def _update_gauge(self, name, series):
         """Update a gauge"""
         try:
-            gauge = series.get("gauge")
-            data = series["data"]
+            gauge = series.plot
             
-            if gauge and data:
+            if gauge and series.count:
                 # Use the most recent value
-                value = data[-1][1]
+                value = series.latest()
                 
                 # Update the gauge
                 gauge.set_value(value)
@@ -412,21 +704,29 @@ class VisualizationPanel(QWidget):
         """Set the update interval"""
         try:
             self.update_interval = interval
+            self.update_timer.setTimerType(self._timer_type(interval))
             self.update_timer.setInterval(interval)
             logger.debug(f"Update interval set to {interval} ms")
         except Exception as e:
             logger.error(f"Error setting update interval: {e}")
     
+    @staticmethod
+    def _timer_type(interval):
+        """Get the timer type for an update interval"""
+        # Short intervals need precise timing, longer ones can let the OS coalesce wakeups
+        if interval < 100:
+            return Qt.TimerType.PreciseTimer
+        return Qt.TimerType.CoarseTimer
+    
     def _set_max_data_points(self, max_points):
         """Set the maximum number of data points"""
         try:
             self.max_data_points = max_points
             logger.debug(f"Max data points set to {max_points}")
             
-            # Trim existing data series if needed
-            for name, series in self.data_series.items():
-                if len(series["data"]) > max_points:
-                    series["data"] = series["data"][-max_points:]
+            # Reallocate the ring buffers, keeping the most recent samples
+            for series in self.data_series.values():
+                series.resize(max_points)
         except Exception as e:
             logger.error(f"Error setting max data points: {e}")
     
@@ -469,17 +769,10 @@ class VisualizationPanel(QWidget):
             if not series:
                 raise ValueError(f"Visualization not found: {name}")
             
-            with open(file_path, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Write header
-                writer.writerow(["Timestamp", "Value"])
-                
-                # Write data
-                for timestamp, value in series["data"]:
-                    # Convert timestamp to readable format
-                    dt = datetime.fromtimestamp(timestamp)
-                    writer.writerow([dt.strftime("%Y-%m-%d %H:%M:%S.%f"), value])
+            # Format all rows in NumPy and write them in one call
+            ts, val = series.data()
+            rows = np.column_stack((self._format_timestamps(series, ts), val.astype(str)))
+            np.savetxt(file_path, rows, fmt="%s", delimiter=",", header="Timestamp,Value", comments="")
         except Exception as e:
             logger.error(f"Error exporting CSV: {e}")
             raise
@@ -493,28 +786,40 @@ class VisualizationPanel(QWidget):
                 raise ValueError(f"Visualization not found: {name}")
             
             # Prepare the data
+            ts, val = series.data()
             export_data = {
                 "name": name,
-                "config": series["config"],
-                "data": []
+                "config": series.config,
+                "data": [
+                    {"timestamp": timestamp, "value": value}
+                    for timestamp, value in zip(self._format_timestamps(series, ts).tolist(), val.tolist())
+                ]
             }
             
-            # Add the data points
-            for timestamp, value in series["data"]:
-                # Convert timestamp to readable format
-                dt = datetime.fromtimestamp(timestamp)
-                export_data["data"].append({
-                    "timestamp": dt.strftime("%Y-%m-%d %H:%M:%S.%f"),
-                    "value": value
-                })
-            
             # Write to file
-            with open(file_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            if orjson:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(export_data, f, indent=2)
         except Exception as e:
             logger.error(f"Error exporting JSON: {e}")
             raise
     
+    @staticmethod
+    def _format_timestamps(series, ts):
+        """Format sample times as local "%Y-%m-%d %H:%M:%S.%f" strings"""
+        if not len(ts):
+            return np.array([], dtype=str)
+        
+        # Shift to local time using the UTC offset at the first sample
+        wall = ts + series.wall_t0
+        offset = datetime.fromtimestamp(wall[0]).astimezone().utcoffset().total_seconds()
+        
+        times = ((wall + offset) * 1e6).astype("datetime64[us]")
+        return np.char.replace(np.datetime_as_string(times, unit="us"), "T", " ")
+    
     def get_visualization_state(self):
         """Get the current state of all visualizations"""
         try:
@@ -523,7 +828,7 @@ class VisualizationPanel(QWidget):
             for name, series in self.data_series.items():
                 state.append({
                     "name": name,
-                    "config": series["config"],
+                    "config": series.config,
                     # Don't include the actual data, just the configuration
                 })
             
@@ -749,93 +1054,249 @@ class GaugeWidget(QWidget):
         self.units = units
         self.color = QColor(color)
         
+        # Maps a value to a needle lookup table step
+        self._needle_scale = (_NEEDLE_STEPS - 1) / (max_value - min_value)
+        
+        # Pens and brushes used on every repaint
+        self._bg_pen = QPen(Qt.GlobalColor.black, 2)
+        self._bg_brush = QBrush(Qt.GlobalColor.white)
+        self._arc_pen = QPen(self.color, 10)
+        self._needle_pen = QPen(Qt.GlobalColor.red, 2)
+        self._needle_brush = QBrush(Qt.GlobalColor.red)
+        self._hub_brush = QBrush(Qt.GlobalColor.black)
+        self._text_pen = QPen(Qt.GlobalColor.black)
+        
+        # Fonts for the value and name text, based on the widget font
+        self._value_font = QFont(self.font())
+        self._value_font.setPointSize(12)
+        self._value_font_description = self._value_font.toString()
+        self._name_font = QFont(self.font())
+        self._name_font.setPointSize(14)
+        self._name_font.setBold(True)
+        
+        # Value text and needle end point shown by the last repaint
+        self._last_display = None
+        
+        # Span of the value arc in whole 1/16ths of a degree, drawArc only takes ints
+        self._arc_span = 0
+        
+        # Dial background, rendered once per widget size
+        self._static_pixmap = None
+        self._cached_size = None
+        
         # Set minimum size
         self.setMinimumSize(200, 200)
+        
+        # Size-derived geometry, updated on resize
+        self._update_geometry()
+        
+        # Name text, laid out once
+        self._name_static = None
+        self._name_pos = QPointF()
+        self.set_name(name)
+        
+        # Value text and its position, updated when the shown value changes
+        self._value_tenths = None
+        self._value_static = None
+        self._value_pos = QPointF()
+        self._place_value(round(self.value * 10))
     
-    def set_value(self, value):
-        """Set the gauge value"""
-        # Clamp the value to the range
-        self.value = max(self.min_value, min(self.max_value, value))
+    def set_name(self, name):
+        """Set the gauge name"""
+        self.name = name
         
-        # Trigger a repaint
+        self._name_static = QStaticText(name)
+        self._name_static.setTextFormat(Qt.TextFormat.PlainText)
+        self._name_static.prepare(QTransform(), self._name_font)
+        self._place_name()
+        
+        # The name is part of the cached background
+        self._static_pixmap = None
         self.update()
     
-    def paintEvent(self, event):
-        """Paint the gauge"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Calculate the gauge rectangle
+    def set_value(self, value):
+        """Set the gauge value"""
+        # Clamp the value to the range (NaN goes to the minimum), the needle lookup relies on it
+        if not value >= self.min_value:
+            value = self.min_value
+        elif value > self.max_value:
+            value = self.max_value
+        old_value = self.value
+        self.value = value
+        
+        # The arc spans 270 degrees clockwise at the maximum value
+        value_fraction = (value - self.min_value) / (self.max_value - self.min_value)
+        self._arc_span = round(value_fraction * -270 * 16)
+        
+        # Only repaint when the displayed text or the needle's end pixel changes
+        tenths = round(value * 10)
+        display = (tenths, self._needle_end(value))
+        if display == self._last_display:
+            return
+        old_display = self._last_display
+        self._last_display = display
+        
+        # Not painted yet, nothing to limit the repaint to
+        if old_display is None:
+            self._place_value(tenths)
+            self.update()
+            return
+        
+        # Repaint the old and new needle, the changed part of the arc and the value text
+        region = QRegion(self._needle_rect(*old_display[1]))
+        region = region.united(QRegion(self._needle_rect(*display[1])))
+        region = region.united(QRegion(self._arc_rect(old_value, value)))
+        
+        if tenths != self._value_tenths:
+            region = region.united(QRegion(self._value_rect))
+            self._place_value(tenths)
+            region = region.united(QRegion(self._value_rect))
+        
+        self.update(region)
+    
+    def _needle_rect(self, end_x, end_y):
+        """Get the area covered by the needle and the hub for a needle end point"""
+        margin = 6  # Hub radius and pen width
+        return QRect(
+            QPoint(min(self._cx, end_x) - margin, min(self._cy, end_y) - margin),
+            QPoint(max(self._cx, end_x) + margin, max(self._cy, end_y) + margin)
+        )
+    
+    def _arc_rect(self, value_a, value_b):
+        """Get the area of the arc that changes between two values"""
+        low, high = sorted(((value_a - self.min_value) * self._needle_scale, (value_b - self.min_value) * self._needle_scale))
+        
+        # The arc's ends, plus the top, right and bottom of the dial if the arc passes them
+        steps = [int(low), int(high)]
+        for extreme in (1 / 6, 1 / 2, 5 / 6):
+            step = extreme * (_NEEDLE_STEPS - 1)
+            if low < step < high:
+                steps.append(int(step))
+        
+        # The arc is drawn with y pointing up, unlike the needle lookup
+        radius = self._gauge_rect.width() / 2
+        xs = [self._cx + radius * _NEEDLE_COS[step] for step in steps]
+        ys = [self._cy - radius * _NEEDLE_SIN[step] for step in steps]
+        
+        margin = self._arc_pen.width() // 2 + 2
+        return QRectF(QPointF(min(xs), min(ys)), QPointF(max(xs), max(ys))).toAlignedRect().adjusted(
+            -margin, -margin, margin, margin
+        )
+    
+    def _needle_end(self, value):
+        """Get the needle end point for a value, in whole pixels"""
+        # Lookup table step for the value, in range since set_value clamps
+        step = int((value - self.min_value) * self._needle_scale)
+        
+        return (
+            round(self._cx + self._needle_length * _NEEDLE_COS[step]),
+            round(self._cy + self._needle_length * _NEEDLE_SIN[step])
+        )
+    
+    def _update_geometry(self):
+        """Calculate the gauge layout for the current widget size"""
         rect = self.rect()
         size = min(rect.width(), rect.height()) - 20
-        gauge_rect = QRectF(
+        
+        self._gauge_rect = QRectF(
             rect.center().x() - size/2,
             rect.center().y() - size/2,
             size,
             size
         )
+        self._center = QPoint(rect.center())
+        self._cx = self._center.x()
+        self._cy = self._center.y()
+        self._needle_length = size / 2 - 10
+        
+        # Text is centered horizontally, the value below the middle and the name above it
+        self._text_center_x = rect.width() / 2
+        self._value_text_y = size / 2 + 10
+        self._name_text_bottom = rect.height() - size / 2 - 10
+    
+    def _place_name(self):
+        """Position the name text for the current layout"""
+        name_size = self._name_static.size()
+        self._name_pos = QPointF(
+            self._text_center_x - name_size.width() / 2,
+            self._name_text_bottom - name_size.height()
+        )
+    
+    def _place_value(self, tenths):
+        """Get the value text for a value in whole tenths and position it"""
+        self._value_tenths = tenths
+        self._value_static = _value_static_text(tenths, self.units, self._value_font_description)
+        self._value_pos = QPointF(
+            self._text_center_x - self._value_static.size().width() / 2,
+            self._value_text_y
+        )
+        self._value_rect = QRectF(self._value_pos, self._value_static.size()).toAlignedRect().adjusted(-1, -1, 1, 1)
+    
+    def resizeEvent(self, event):
+        """Update the layout and drop the cached background when the widget is resized"""
+        self._update_geometry()
+        self._place_name()
+        self._place_value(self._value_tenths)
+        self._static_pixmap = None
+        super().resizeEvent(event)
+    
+    def _render_static(self):
+        """Render the parts of the gauge that don't depend on the value"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw the gauge background
-        painter.setPen(QPen(Qt.GlobalColor.black, 2))
-        painter.setBrush(QBrush(Qt.GlobalColor.white))
-        painter.drawEllipse(gauge_rect)
-        
-        # Draw the gauge value
-        start_angle = 135 * 16  # Start at 135 degrees (7:30 position)
-        span_angle = -270 * 16  # Span 270 degrees counter-clockwise
+        painter.setPen(self._bg_pen)
+        painter.setBrush(self._bg_brush)
+        painter.drawEllipse(self._gauge_rect)
         
-        # Calculate the value angle
-        value_fraction = (self.value - self.min_value) / (self.max_value - self.min_value)
-        value_angle = start_angle + value_fraction * span_angle
+        # Draw the name
+        painter.setPen(self._text_pen)
+        painter.setFont(self._name_font)
+        painter.drawStaticText(self._name_pos, self._name_static)
+        painter.end()
         
-        # Draw the gauge arc
-        painter.setPen(QPen(self.color, 10))
-        painter.drawArc(gauge_rect, start_angle, value_angle - start_angle)
+        self._static_pixmap = pixmap
+        self._cached_size = self.size()
+    
+    def paintEvent(self, event):
+        """Paint the gauge"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Draw the gauge needle
-        painter.setPen(QPen(Qt.GlobalColor.red, 2))
-        painter.setBrush(QBrush(Qt.GlobalColor.red))
+        # Draw the cached gauge background
+        if self._static_pixmap is None or self._cached_size != self.size():
+            self._render_static()
+        painter.drawPixmap(0, 0, self._static_pixmap)
         
-        center = gauge_rect.center()
-        needle_length = size / 2 - 10
+        # Draw the gauge arc, starting at 135 degrees (7:30 position)
+        painter.setPen(self._arc_pen)
+        painter.drawArc(self._gauge_rect, 135 * 16, self._arc_span)
         
-        # Convert angle from 1/16th degrees to radians
-        angle_rad = (value_angle / 16) * math.pi / 180
+        # Draw the gauge needle
+        painter.setPen(self._needle_pen)
+        painter.setBrush(self._needle_brush)
         
-        # Calculate needle endpoint
-        end_x = center.x() + needle_length * math.cos(angle_rad)
-        end_y = center.y() + needle_length * math.sin(angle_rad)
+        # Calculate needle endpoint, in whole pixels
+        end_x, end_y = self._needle_end(self.value)
+        self._last_display = (self._value_tenths, (end_x, end_y))
         
-        # Draw the needle
-        painter.drawLine(center.x(), center.y(), end_x, end_y)
+        # Draw the needle with integer coordinates, antialiasing a thin straight line isn't worth its cost
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.drawLine(self._cx, self._cy, end_x, end_y)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw a circle at the center
-        painter.setBrush(QBrush(Qt.GlobalColor.black))
-        painter.drawEllipse(center, 5, 5)
+        painter.setBrush(self._hub_brush)
+        painter.drawEllipse(self._center, 5, 5)
         
         # Draw the value text
-        painter.setPen(QPen(Qt.GlobalColor.black))
-        font = painter.font()
-        font.setPointSize(12)
-        painter.setFont(font)
-        
-        value_text = f"{self.value:.1f}"
-        if self.units:
-            value_text += f" {self.units}"
-        
-        painter.drawText(
-            rect.adjusted(0, size/2 + 10, 0, 0),
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-            value_text
-        )
+        painter.setPen(self._text_pen)
+        painter.setFont(self._value_font)
         
-        # Draw the name
-        font.setPointSize(14)
-        font.setBold(True)
-        painter.setFont(font)
-        
-        painter.drawText(
-            rect.adjusted(0, 0, 0, -size/2 - 10),
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom,
-            self.name
-        )
\ No newline at end of file
+        painter.drawStaticText(self._value_pos, self._value_static)
\ No newline at end of file
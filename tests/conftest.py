@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Universal Hardware Debugger and Serial Monitor
+Shared test setup
+"""
+
+import os
+import sys
+
+import pytest
+
+# Widgets are rendered without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# The application imports its modules as src.*
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Get the QApplication the widget tests run in"""
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Universal Hardware Debugger and Serial Monitor
+Tests for the gauge widget
+"""
+
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("numpy")
+pytest.importorskip("pyqtgraph")
+
+from src.ui.visualization import GaugeWidget
+
+
+def test_gauge_paints(qapp, monkeypatch):
+    """The whole gauge paints, value arc, needle and text included"""
+    # Exceptions raised in paintEvent go to the excepthook, not to grab()
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc_info: errors.append(exc_info))
+    
+    gauge = GaugeWidget(min_value=0, max_value=100, name="Temperature", units="C")
+    gauge.resize(240, 240)
+    
+    for value in (0, 12.34, 55.5, 100, 250, -10):
+        gauge.set_value(value)
+        
+        # paintEvent records what it drew once it gets past the arc to the needle
+        gauge._last_display = None
+        pixmap = gauge.grab()
+        
+        assert not errors
+        assert not pixmap.isNull()
+        assert gauge._last_display == (round(gauge.value * 10), gauge._needle_end(gauge.value))
+
+
+def test_gauge_clamps_value(qapp):
+    """Values outside the range are clamped"""
+    gauge = GaugeWidget(min_value=-5, max_value=5)
+    
+    gauge.set_value(50)
+    assert gauge.value == 5
+    
+    gauge.set_value(float("nan"))
+    assert gauge.value == -5
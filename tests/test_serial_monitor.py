@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Universal Hardware Debugger and Serial Monitor
+Tests for the serial monitor
+"""
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from src.ui.serial_monitor import SerialMonitor
+
+
+@pytest.mark.parametrize("filter_text, line, matches", [
+    ("err", "ERROR: overheat", True),
+    ("12,34", "values 12,34", True),
+    ("12,34", "values 12 34", False),
+    ("12,34", "34", False),
+    (", ERR", "code 5, ERROR", True),
+    (", ERR", "ERROR", False),
+    ("a.b", "axb", False),
+])
+def test_filter_is_a_literal_substring(filter_text, line, matches):
+    """Filters match their text literally, commas and regex characters included"""
+    pattern = SerialMonitor._compile_filter(filter_text)
+    assert bool(pattern.search(line.casefold())) == matches